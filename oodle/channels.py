@@ -1,16 +1,22 @@
-from queue import Queue
+from collections import deque
+from threading import Event
 from typing import Callable
 
 import oodle
 
 
 class Channel[T]:
-    """A simple wrapper around a queue.Queue to make using them a bit simpler. It is a context manager so that the
-    channel can be closed automatically. It is also an iterator that can block while waiting for more results.
+    """A simple thread safe queue to make passing values between threads a bit simpler. It is a context manager so that
+    the channel can be closed automatically. It is also an iterator that can block while waiting for more results.
+
+    Values are stored in a deque so that put and get never need a Python level lock, getters only block on an event
+    when the channel is empty.
 
     on_put_callback can be used to assign a function that is called when a new item is put into the channel."""
     def __init__(self, *, on_put_callback: Callable[[T], None] | None = None):
-        self._queue = Queue()
+        self._queue: deque[T] = deque()
+        self._closed = False
+        self._not_empty = Event()
         self._on_put_callback = on_put_callback
 
     def __enter__(self):
@@ -24,53 +30,71 @@ class Channel[T]:
         return self
 
     def __next__(self):
-        if self.is_empty:
-            raise StopIteration
-
-        return self.get()
+        try:
+            return self._queue.popleft()
+        except IndexError:
+            raise StopIteration from None
 
     @property
     def is_closed(self) -> bool:
-        return self._queue is None
+        return self._closed
 
     @property
     def is_empty(self) -> bool:
-        return self._queue.empty()
+        return self._closed or not self._queue
 
     def close(self):
-        self._queue.shutdown(True)
-        self._queue = None
+        self._closed = True
+        self._queue.clear()
+        self._not_empty.set()
 
     def put(self, value: T):
         """Puts a value into the channel queue. Raises ValueError if the channel is closed. Calls on_put_callback when a
         value is put."""
-        if self._queue is None:
+        if self._closed:
             raise ValueError("Channel is closed")
 
-        self._queue.put(value)
+        self._queue.append(value)
+        if not self._not_empty.is_set():
+            self._not_empty.set()
+
         if self._on_put_callback:
             self._on_put_callback(value)
 
     def get(self) -> T:
         """Gets a value from the channel queue. Raises ValueError if the channel is closed. Blocks until a value is
         received."""
-        if self._queue is None:
-            raise ValueError("Channel is closed")
+        while True:
+            if self._closed:
+                raise ValueError("Channel is closed")
+
+            try:
+                return self._queue.popleft()
+            except IndexError:
+                pass
 
-        return self._queue.get()
+            # Clearing before re-checking means a put that lands between the failed pop and the clear is still seen
+            self._not_empty.clear()
+            if not self._queue and not self._closed:
+                self._not_empty.wait()
 
     @classmethod
     def get_first(cls, *funcs: "Callable[[Channel[T]], None]") -> T:
         """This classmethod runs all functions it is passed in a ThreadGroup and passes them a shared channel. When a
         value is put into the channel the ThreadGroup is stopped and the value is returned from the channel."""
+        first_put = Event()
+
         def on_put_callback(_):
-            group.stop()
+            if not first_put.is_set():
+                first_put.set()
+                group.stop()
 
         with cls(on_put_callback=on_put_callback) as channel:
             with oodle.ThreadGroup() as group:
                 for func in funcs:
                     group.run(func, channel)
 
-            result = channel.get()
+            # The first value is already in the channel when the group stops on it, so there's nothing to block on
+            result = channel._queue.popleft() if first_put.is_set() else channel.get()
 
         return result
@@ -1,9 +1,11 @@
+import os
+from collections import deque
 from concurrent.futures import Future
 from functools import partial, wraps
-from queue import Queue
-from threading import Event, current_thread
+from itertools import count
+from threading import Condition, Event, Lock, Semaphore, current_thread, get_ident, local
 from types import MethodType, FunctionType
-from typing import Callable, Self, overload, Type, Any
+from typing import Callable, Literal, Self, overload, Type, Any
 
 import oodle
 from oodle import Thread
@@ -15,54 +17,211 @@ class IllegalDispatchException(Exception):
     would result in deadlock."""
 
 
+class _DispatchResult[R]:
+    """A lightweight stand-in for a Future used by blocking dispatches. Each calling thread reuses a single instance
+    since a thread can only be blocked on one dispatch at a time."""
+    __slots__ = ("_event", "_result", "_exception")
+
+    def __init__(self):
+        self._event = Event()
+        self._result = self._exception = None
+
+    def set_result(self, result: R):
+        self._result = result
+        self._event.set()
+
+    def set_exception(self, exception: Exception):
+        self._exception = exception
+        self._event.set()
+
+    def wait(self):
+        self._event.wait()
+
+    def take(self) -> R:
+        """Returns the result, raising the exception if there was one, and resets the slot so it can be reused."""
+        self._event.clear()
+        result, exception = self._result, self._exception
+        self._result = self._exception = None
+        if exception is not None:
+            raise exception
+
+        return result
+
+
+_dispatch_results = local()
+
+# Queued calls are stored unbound so dispatching doesn't need to allocate a partial
+type _DispatchItem[**P, R] = tuple[Future[R] | _DispatchResult[R], Callable[P, R], tuple, dict]
+
+
 class DispatchQueue[**P, R]:
     """Dispatch queues allow function calls to be dispatched all on a single thread in the order they were originally
     called."""
     def __init__(self):
-        self._queue: Queue[tuple[Future[R], Callable[P, R]]] = Queue()
+        self._queue: deque[_DispatchItem[P, R]] = deque()
+        self._condition = Condition()
         self._started = Event()
         self._thread = Thread.run(self._dispatch)
+        self._thread_ident = self._thread.ident
         self._started.set()
 
     def dispatch(self, func: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
         """Dispatches a function call to the queue to be called when all prior dispatches finish. This blocks until the
         function returns and returns the result. Raises IllegalDispatchException if called on the same thread that the
         dispatch queue was created on."""
-        return self.dispatch_future(func, *args, **kwargs).result()
+        return self._dispatch_sync(func, *args, **kwargs)
 
     def dispatch_future(self, func: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> Future[R]:
         """Dispatches a function call to the queue to be called when all prior dispatches finish. This returns a
         concurrent.futures.Future that resolves to the return of the function once it is run. Raises
         IllegalDispatchException if called on the same thread that the dispatch queue was created on."""
-        if getattr(oodle.thread_locals, "thread", None) == self._thread:
+        if get_ident() == self._thread_ident:
             raise IllegalDispatchException("Cannot dispatch on dispatch thread, will dead lock")
 
         future = Future()
-        self._queue.put((future, partial(func, *args, **kwargs)))
+        self._put((future, func, args, kwargs))
         return future
 
     def safe_dispatch(self, func: Callable[P, R], *args, **kwargs: P.kwargs) -> R:
         """Dispatches a function call to the queue to be called when all prior dispatches finish. This blocks until the
         function returns and returns the result. If called on the same thread that the dispatch queue was created on,
         the function is not queued and is instead called immediately."""
-        if getattr(oodle.thread_locals, "thread", None) == self._thread:
+        if get_ident() == self._thread_ident:
             return func(*args, **kwargs)
 
         return self.dispatch(func, *args, **kwargs)
 
+    def _dispatch_sync(self, func: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+        if get_ident() == self._thread_ident:
+            raise IllegalDispatchException("Cannot dispatch on dispatch thread, will dead lock")
+
+        result = getattr(_dispatch_results, "result", None)
+        if result is None:
+            result = _dispatch_results.result = _DispatchResult()
+
+        self._put((result, func, args, kwargs))
+        try:
+            result.wait()
+        except BaseException:
+            # The dispatch thread may still write to the abandoned slot, so don't reuse it
+            _dispatch_results.result = None
+            raise
+
+        return result.take()
+
     def stop(self):
         """Stops the dispatch thread. This does not empty the dispatch queue."""
         self._thread.stop()
+        with self._condition:
+            self._condition.notify()
+
+    def _put(self, item: _DispatchItem[P, R]):
+        with self._condition:
+            self._queue.append(item)
+            self._condition.notify()
 
     def _dispatch(self):
         self._started.wait()
-        while self._thread.running:
-            future, func = self._queue.get()
+        while not self._thread.stopping:
+            # Drain everything queued on each wakeup so a busy queue doesn't pay a condition round trip per call
+            with self._condition:
+                while not self._queue and not self._thread.stopping:
+                    self._condition.wait()
+
+                items, self._queue = self._queue, deque()
+
+            for future, func, args, kwargs in items:
+                try:
+                    result = func(*args, **kwargs) if args or kwargs else func()
+                except Exception as e:
+                    shutdown_exceptions = ExitThread
+                    if self._thread.stopping:
+                        shutdown_exceptions |= SystemError
+
+                    if isinstance(e, shutdown_exceptions):
+                        return
+
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+
+
+class WorkStealingDispatchPool[**P, R]:
+    """Dispatch pools run dispatched function calls across multiple worker threads. Each worker owns a deque that it
+    runs newest first, idle workers steal the oldest half of another worker's deque. Calls dispatched from a worker
+    are queued on that worker's own deque.
+
+    Setting mode to "ordered" runs all calls on a single DispatchQueue so they run one at a time in the order they were
+    dispatched."""
+    def __init__(self, workers: int | None = None, *, mode: Literal["stealing", "ordered"] = "stealing"):
+        self._ordered_queue: DispatchQueue[P, R] | None = None
+        self._workers: list[Thread] = []
+        if mode == "ordered":
+            self._ordered_queue = DispatchQueue()
+            return
+
+        worker_count = workers or os.cpu_count() or 1
+        self._deques: list[deque[_DispatchItem[P, R]]] = [deque() for _ in range(worker_count)]
+        self._locks = [Lock() for _ in range(worker_count)]
+        self._pending = Semaphore(0)
+        self._next_worker = count()
+        self._worker_index = local()
+        self._stopping = False
+        self._workers = [Thread.run(self._work, index) for index in range(worker_count)]
+
+    def dispatch(self, func: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+        """Dispatches a function call to the pool. This blocks until the function returns and returns the result. If
+        called from one of the pool's workers the function is called immediately so the worker can't starve the pool
+        by blocking on it."""
+        if self._ordered_queue:
+            return self._ordered_queue.dispatch(func, *args, **kwargs)
+
+        if hasattr(self._worker_index, "index"):
+            return func(*args, **kwargs)
+
+        return self.dispatch_future(func, *args, **kwargs).result()
+
+    def dispatch_future(self, func: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> Future[R]:
+        """Dispatches a function call to the pool. This returns a concurrent.futures.Future that resolves to the return
+        of the function once it is run."""
+        if self._ordered_queue:
+            return self._ordered_queue.dispatch_future(func, *args, **kwargs)
+
+        index = getattr(self._worker_index, "index", None)
+        if index is None:
+            index = next(self._next_worker) % len(self._deques)
+
+        future = Future()
+        with self._locks[index]:
+            self._deques[index].append((future, func, args, kwargs))
+
+        self._pending.release()
+        return future
+
+    def stop(self):
+        """Stops the worker threads once they finish their current call. This does not empty the worker deques."""
+        if self._ordered_queue:
+            self._ordered_queue.stop()
+            return
+
+        self._stopping = True
+        self._pending.release(len(self._workers))
+
+    def _work(self, index: int):
+        self._worker_index.index = index
+        thread = oodle.thread_locals.thread
+        while True:
+            # Every queued call releases the semaphore once, so after acquiring there is a call to take somewhere
+            self._pending.acquire()
+            if self._stopping:
+                break
+
+            future, func, args, kwargs = self._take(index)
             try:
-                result = func()
+                result = func(*args, **kwargs) if args or kwargs else func()
             except Exception as e:
                 shutdown_exceptions = ExitThread
-                if self._thread.stopping:
+                if thread.stopping:
                     shutdown_exceptions |= SystemError
 
                 if isinstance(e, shutdown_exceptions):
@@ -72,31 +231,67 @@ class DispatchQueue[**P, R]:
             else:
                 future.set_result(result)
 
+    def _take(self, index: int) -> _DispatchItem[P, R]:
+        own, own_lock = self._deques[index], self._locks[index]
+        while True:
+            with own_lock:
+                if own:
+                    return own.pop()
+
+            for offset in range(1, len(self._deques)):
+                victim = (index + offset) % len(self._deques)
+                victim_deque = self._deques[victim]
+                with self._locks[victim]:
+                    stolen = [victim_deque.popleft() for _ in range((len(victim_deque) + 1) // 2)]
+
+                if stolen:
+                    if len(stolen) > 1:
+                        with own_lock:
+                            own.extend(stolen[1:])
+
+                    return stolen[0]
+
 
 class QueuedDispatcher:
     """Base type for types that need their methods to exist in a single thread of execution. This eliminates the need
     for synchronisation primitives to order operations. All public methods (excluding classmethods and staticmethods)
-    and properties are wrapped in a dispatch queue. All methods can be called as normal, QueuedDispatch handles calling
-    the function in a dispatch queue, blocking until it finishes, and returning the result."""
+    and properties defined on subclasses are wrapped in a dispatch queue. All methods can be called as normal,
+    QueuedDispatch handles calling the function in a dispatch queue, blocking until it finishes, and returning the
+    result."""
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self._dispatch_queue = DispatchQueue()
 
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
-        for name in dir(cls):
-            if name.startswith("_"):
-                continue
+        # Walk the class dicts in MRO order so each name resolves the same way getattr would. Methods from parent
+        # QueuedDispatchers were already wrapped when those classes were created, methods from mixins still need to be.
+        seen = set()
+        to_wrap = []
+        for klass in cls.__mro__:
+            already_wrapped = klass is not cls and issubclass(klass, QueuedDispatcher)
+            for name, attr in klass.__dict__.items():
+                if name in seen:
+                    continue
+
+                seen.add(name)
+                if not already_wrapped and not name.startswith("_") and isinstance(attr, FunctionType | property):
+                    to_wrap.append((name, attr))
 
-            attr = getattr(cls, name)
-            if isinstance(attr, FunctionType | property):
-                setattr(cls, name, QueuedDispatchDescriptor(attr))
+        for name, attr in to_wrap:
+            descriptor = QueuedDispatchDescriptor(attr)
+            descriptor.__set_name__(cls, name)
+            setattr(cls, name, descriptor)
 
 
 class QueuedDispatchDescriptor[**P, R]:
     """This descriptor is used to wrap methods and properties that rely on the dispatch queue."""
     def __init__(self, func: Callable[P, R]):
         self.func = func
+        self._cache_name = None
+
+    def __set_name__(self, owner: Type, name: str):
+        self._cache_name = f"_qd_{name}"
 
     @overload
     def __get__(self, instance: None, owner: Type) -> Self:
@@ -111,9 +306,9 @@ class QueuedDispatchDescriptor[**P, R]:
             return self
 
         if isinstance(self.func, property):
-            return instance._dispatch_queue.safe_dispatch(self.func.fget, instance)
+            return self._get_bound(instance, self.func.fget)()
 
-        return partial(instance._dispatch_queue.safe_dispatch, self.func, instance)
+        return self._get_bound(instance, self.func)
 
     def __set__(self, instance, value):
         if isinstance(self.func, property):
@@ -121,15 +316,53 @@ class QueuedDispatchDescriptor[**P, R]:
         else:
             self.func = value
 
+    def _get_bound(self, instance: QueuedDispatcher, func: Callable[P, R]) -> Callable[P, R]:
+        """Gets the dispatching callable for the instance, creating it on first access and caching it on the instance
+        so later accesses don't need to allocate a new partial. The cached partial is replaced if it was made for a
+        different function or instance, copies of an instance carry the original's cache in their __dict__."""
+        if self._cache_name is None:
+            return partial(instance._dispatch_queue.safe_dispatch, func, instance)
+
+        bound = instance.__dict__.get(self._cache_name)
+        if bound is None or bound.args[0] is not func or bound.args[1] is not instance:
+            bound = partial(instance._dispatch_queue.safe_dispatch, func, instance)
+            instance.__dict__[self._cache_name] = bound
+
+        return bound
+
 
-def queued_dispatch[**P, R](func: Callable[P, R]) -> Callable[P, R]:
+_shared_queue: DispatchQueue | None = None
+_shared_queue_lock = Lock()
+
+
+def queued_dispatch[**P, R](
+    func: Callable[P, R] | None = None, *, queue: DispatchQueue | None = None, per_function: bool = False
+) -> Callable[P, R]:
     """This decorator can be used to wrap a function in a dispatch queue. This queues all calls to the function. Calls
     to the function block until the function is run and returns. The result is returned. This uses safe_dispatch to
-    allow the function to be recursive."""
-    queue = DispatchQueue()
+    allow the function to be recursive.
+
+    By default all decorated functions share a single dispatch queue, so calls are ordered across every decorated
+    function, not just each function on its own. A queue can be passed to use instead, or per_function can be set to
+    give the function its own dedicated queue. Use a separate queue for functions that block waiting on other
+    decorated functions from another thread, otherwise they will dead lock on the shared queue."""
+    if func is None:
+        return partial(queued_dispatch, queue=queue, per_function=per_function)
+
+    if queue is None:
+        queue = DispatchQueue() if per_function else _get_shared_queue()
 
     @wraps(func)
     def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
         return queue.safe_dispatch(func, *args, **kwargs)
 
     return wrapper
+
+
+def _get_shared_queue() -> DispatchQueue:
+    global _shared_queue
+    with _shared_queue_lock:
+        if _shared_queue is None:
+            _shared_queue = DispatchQueue()
+
+        return _shared_queue
@@ -1,16 +1,16 @@
 import sys
-from functools import cache
 import time
+from types import ModuleType
 from ..utilities import sleep
 
 
-class TimeProxy:
-    @cache
-    def __getattr__(self, item):
-        if item == "sleep":
-            return sleep
-
-        return getattr(time, item)
+class TimeProxy(ModuleType):
+    """A copy of the time module with sleep replaced by oodle.utilities.sleep. Attributes live in the module's own
+    __dict__ so lookups don't need to go through a Python level __getattr__."""
+    def __init__(self):
+        super().__init__(time.__name__, time.__doc__)
+        vars(self).update(vars(time))
+        self.sleep = sleep
 
 
 def patch_time():
@@ -17,7 +17,8 @@ class Shield:
         return
 
     def _get_lock(self) -> RLock:
-        if hasattr(oodle.thread_locals, "shield_lock"):
-            return oodle.thread_locals.shield_lock
+        thread = getattr(oodle.thread_locals, "thread", None)
+        if thread is None:
+            raise Exception("Shields can only be used with threads created by Oodle")
 
-        raise Exception("Shields can only be used with threads created by Oodle")
+        return thread._get_shield_lock()
@@ -1,19 +1,27 @@
+from collections import deque
 from functools import partial
-from threading import Event, Lock
-from typing import Callable, Generator
+from threading import Condition, Event
+from typing import Callable, Iterable
 from oodle.threads import Thread
 
 
+# ThreadGroup packs its flags and the count of remaining threads into a single state int
+_STOPPING = 0b01
+_HAS_EXCEPTION = 0b10
+_REMAINING_SHIFT = 2
+_ONE_REMAINING = 1 << _REMAINING_SHIFT
+
+
 class ThreadGroup:
     """Thread groups manage multiple threads, stopping them all if any raise an exception.
 
     ThreadGroup can be used as a context manager. All exceptions raised in the threads are then raised in the calling
     thread as an ExceptionGroup."""
     def __init__(self):
-        self._threads, self._running_threads = [], []
-        self._exception_lock = Lock()
-        self._thread_event = Event()
-        self._stopping = Event()
+        self._state = 0
+        self._threads: list[Thread] = []
+        self._exceptions: deque[Exception] = deque()
+        self._condition = Condition()
 
     def __enter__(self):
         return self
@@ -25,32 +33,55 @@ class ThreadGroup:
     @property
     def running(self) -> bool:
         """Returns true as long as there are threads running in the group."""
-        return len(self._running_threads) > 0
+        return self._state >> _REMAINING_SHIFT > 0
 
     def run[**P](self, func: Callable[P, None], *args: P.args, **kwargs: P.kwargs) -> Thread:
         """Runs a function in a thread that belongs to the thread group."""
         return self._create_thread(func, *args, **kwargs)
 
+    def run_many[*Ts](
+        self, func: Callable[[*Ts], None], args: Iterable[tuple[*Ts]], *, raw: bool = False
+    ) -> list[Thread]:
+        """Runs a function in a thread for each tuple of positional arguments, all belonging to the thread group. The
+        threads are submitted as a single batch that shares one ready event. Setting raw starts them as raw threads,
+        see Thread.spawn_raw for the caveats."""
+        # Collected before starting any threads so an iterable that raises can't leave started threads waiting on ready
+        args = list(args)
+        ready = Event()
+        runner = partial(self._runner, func, ready)
+        threads = [
+            Thread(
+                partial(runner, *thread_args),
+                on_done=self._thread_done,
+                on_exception=self._thread_encountered_exception,
+                raw=raw,
+            )
+            for thread_args in args
+        ]
+        with self._condition:
+            self._threads.extend(threads)
+            self._state += len(threads) * _ONE_REMAINING
+
+        ready.set()
+        return threads
+
     def stop(self):
         """Stops the thread group threads."""
-        self._stopping.set()
-        self._thread_event.set()
+        with self._condition:
+            self._state |= _STOPPING
+            self._condition.notify_all()
 
     def wait(self):
         """Waits until all threads in the group stop. Raises all exceptions that occurred in the threads in the calling
         thread as an ExceptionGroup."""
-        while any(thread.running for thread in self._running_threads):
-            self._thread_event.wait()
-            self._thread_event.clear()
-
-            if self._stopping.is_set():
-                break
+        with self._condition:
+            self._condition.wait_for(lambda: not self._state >> _REMAINING_SHIFT or self._state & _STOPPING)
 
         self._stop_threads()
-        if exceptions := [thread.exception for thread in self._threads if thread.exception]:
+        if self._state & _HAS_EXCEPTION:
             raise ExceptionGroup(
                 f"Exceptions encountered in {self.__class__.__name__}",
-                exceptions,
+                list(self._exceptions),
             )
 
     def _create_thread(self, func, *args, **kwargs):
@@ -60,8 +91,10 @@ class ThreadGroup:
             on_done=self._thread_done,
             on_exception=self._thread_encountered_exception,
         )
-        self._threads.append(thread)
-        self._running_threads.append(thread)
+        with self._condition:
+            self._threads.append(thread)
+            self._state += _ONE_REMAINING
+
         ready.set()
         return thread
 
@@ -71,15 +104,21 @@ class ThreadGroup:
             thread.wait()
 
     def _thread_done(self, thread: Thread):
-        self._running_threads.remove(thread)
-        self._thread_event.set()
+        with self._condition:
+            self._state -= _ONE_REMAINING
+            self._condition.notify_all()
 
     def _thread_encountered_exception(self, exception: Exception, thread: Thread):
-        if not self.running:
+        self._exceptions.append(exception)
+        if self._state & _HAS_EXCEPTION:
             return
 
-        with self._exception_lock:
-            self.stop()
+        with self._condition:
+            if self._state & _HAS_EXCEPTION:
+                return
+
+            self._state |= _HAS_EXCEPTION | _STOPPING
+            self._condition.notify_all()
 
     @staticmethod
     def _runner[**P](func: Callable[P, None], ready: Event, *args: P.args, **kwargs: P.kwargs):
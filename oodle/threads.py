@@ -1,12 +1,35 @@
+import _thread
 import ctypes
 import threading
 from functools import partial
-from threading import Thread as _Thread, Event, Lock, RLock
+from threading import Thread as _Thread, Condition, Event, Lock, RLock
 from typing import Callable, Self
 
 import oodle
 from oodle.exceptions import ExitThread
-from oodle.utilities import safely_acquire, generate_timeout_durations, abort_concurrent_calls
+from oodle.utilities import safely_acquire
+
+
+_get_ident = threading.get_ident
+_shield_lock_creation = Lock()
+
+# Thread states, a thread only ever moves forward through these
+_RUNNING = 0
+_STOPPING = 1
+_DONE = 2
+
+# Our own prototype so ctypes doesn't infer argument types on every call, this avoids changing the shared pythonapi one
+_set_async_exc = ctypes.PYFUNCTYPE(ctypes.c_int, ctypes.c_ulong, ctypes.py_object)(
+    ("PyThreadState_SetAsyncExc", ctypes.pythonapi)
+)
+
+
+class _RunnerThread(_Thread):
+    """A threading.Thread that runs the oodle thread's run method as its own run method. This skips Thread.run and its
+    target, args, and kwargs indirection, keeping one less frame on the stack and in tracebacks."""
+    def __init__(self, run: Callable[[], None]):
+        super().__init__(daemon=True)
+        self.run = run
 
 
 class Thread:
@@ -17,59 +40,70 @@ class Thread:
         *,
         on_done: Callable[[Self], None] | None = None,
         on_exception: Callable[[Exception, Self], None] | None = None,
+        raw: bool = False,
     ):
         self._internal_lock = Lock()
-        self._shield_lock = RLock()
+        self._shield_lock: RLock | None = None
+        self._stop_guard = Lock()
 
-        self._done = Event()
-        self._stopping = Event()
+        self._state = _RUNNING
+        self._state_changed = Condition()
 
         self._on_done = on_done
         self._on_exception = on_exception
 
         self._runner = runner
         self._exception = None
-        self._thread = _Thread(target=self._run, daemon=True)
-        self._thread.start()
+        if raw:
+            self._thread = None
+            self._ident = _thread.start_new_thread(self._run, ())
+        else:
+            self._thread = _RunnerThread(self._run)
+            self._thread.start()
+            self._ident = self._thread.ident
 
     def __repr__(self):
-        return f"<oodle.Thread {self._thread.name} {self._thread.ident}>"
+        name = self._thread.name if self._thread else "raw"
+        return f"<oodle.Thread {name} {self._ident}>"
 
     @property
     def exception(self) -> Exception | None:
         """Any exception raised in the thread."""
         return self._exception
 
+    @property
+    def ident(self) -> int | None:
+        """The thread identifier of the underlying OS thread, this matches threading.get_ident() inside the thread."""
+        return self._ident
+
     @property
     def running(self) -> bool:
         """Returns True if the thread has not finished running. This is True even before the thread begins running."""
-        return not self._done.is_set()
+        return self._state < _DONE
 
     @property
     def stopping(self) -> bool:
         """Returns True if the thread has stopped because of an exception or if Thread.stop has been called."""
-        return self._stopping.is_set()
+        return self._state >= _STOPPING
 
-    @abort_concurrent_calls
     def stop(self, timeout: float = 0):
-        """"""
-        timeout_duration = generate_timeout_durations(timeout)
-        if self._thread.ident == threading.get_ident():
+        """Stops the thread by raising ExitThread in it, waiting for any shields to exit first. Raises TimeoutError if
+        a timeout is given and the shields don't exit in time. Calls made while another thread is already stopping this
+        thread return immediately."""
+        if self._ident == _get_ident():
             raise ExitThread
 
-        if not self.running:
+        if not self._stop_guard.acquire(blocking=False):
             return
 
-        if not self._shield_lock.acquire(timeout=next(timeout_duration) if timeout > 0 else -1):
-            raise TimeoutError
-
-        with self._shield_lock:
-            self._stopping.set()
-            self._throw()
+        try:
+            self._stop(timeout)
+        finally:
+            self._stop_guard.release()
 
     def wait(self, timeout: float | None=None) -> bool:
         try:
-            return self._done.wait(timeout=timeout)
+            return self._wait_until_done(timeout)
         except (ExitThread, RuntimeError, SystemError):
             return False
         finally:
@@ -77,9 +111,47 @@ class Thread:
                 raise self._exception
 
 
+    def _stop(self, timeout: float):
+        if not self.running:
+            return
+
+        shield_lock = self._get_shield_lock()
+        if not shield_lock.acquire(timeout=timeout if timeout > 0 else -1):
+            raise TimeoutError
+
+        try:
+            self._set_state(_STOPPING)
+            self._throw()
+        finally:
+            shield_lock.release()
+
+    def _get_shield_lock(self) -> RLock:
+        """Gets the lock that shields hold, creating it on first use. Most threads are never shielded or stopped so
+        they never need one."""
+        if self._shield_lock is None:
+            with _shield_lock_creation:
+                if self._shield_lock is None:
+                    self._shield_lock = RLock()
+
+        return self._shield_lock
+
+    def _set_state(self, state: int):
+        with self._state_changed:
+            if state > self._state:
+                self._state = state
+                self._state_changed.notify_all()
+
+    def _wait_until_done(self, timeout: float | None) -> bool:
+        with self._state_changed:
+            return self._state_changed.wait_for(lambda: self._state == _DONE, timeout)
+
+    def _wait_until_stopping(self, timeout: float | None) -> bool:
+        with self._state_changed:
+            return self._state_changed.wait_for(lambda: self._state >= _STOPPING, timeout)
+
     def _handle_exception(self, e: Exception) -> bool:
         shutdown_exceptions = ExitThread
-        if self._stopping.is_set():
+        if self.stopping:
             shutdown_exceptions |= SystemError
 
         if isinstance(e, shutdown_exceptions):
@@ -91,15 +163,15 @@ class Thread:
         return False
 
     def _run(self):
+        # Set here as well since the runner can start before the creating thread gets the ident back
+        self._ident = _get_ident()
         oodle.thread_locals.thread = self
-        oodle.thread_locals.shield_lock = self._shield_lock
         try:
             try:
                 self._runner()
             finally:
                 safely_acquire(self._internal_lock)
-                self._stopping.set()
-                self._done.set()
+                self._set_state(_DONE)
 
         except Exception as e:
             if not self._handle_exception(e):
@@ -108,6 +180,10 @@ class Thread:
                 raise
 
         finally:
+            if self._thread:
+                # Break the reference cycle with the threading thread like Thread.run does with its target
+                del self._thread.run
+
             if self._on_done:
                 self._on_done(self)
 
@@ -116,24 +192,30 @@ class Thread:
     def _throw(self):
         if self._internal_lock.acquire(blocking=False):
             try:
-                ctypes.pythonapi.PyThreadState_SetAsyncExc(
-                    ctypes.c_long(self._thread.ident),
-                    ctypes.py_object(ExitThread),
-                )
+                _set_async_exc(self._ident, ExitThread)
             finally:
                 self._internal_lock.release()
 
     @classmethod
     def run[**P](cls, func: Callable[P, None], *args: P.args, **kwargs: P.kwargs) -> Self:
-        return _create(cls, partial(func, *args, **kwargs))
+        return _create(cls, partial(func, *args, **kwargs) if args or kwargs else func)
+
+    @classmethod
+    def spawn_raw[**P](cls, func: Callable[P, None], *args: P.args, **kwargs: P.kwargs) -> Self:
+        """Runs the function like Thread.run but starts the OS thread directly with _thread.start_new_thread, skipping
+        the threading.Thread bookkeeping. This is cheaper for large numbers of short-lived threads. Raw threads are not
+        known to the threading module, so threading.enumerate won't list them and they are never joined at
+        interpreter exit. Before Python 3.13, calling threading.current_thread in a raw thread (logging does this)
+        registers a dummy thread that is never removed."""
+        return _create(cls, partial(func, *args, **kwargs) if args or kwargs else func, raw=True)
 
 
-def _create(cls, func) -> Thread:
+def _create(cls, func, raw: bool = False) -> Thread:
     started = Event()
     def run():
         started.set()
         func()
 
-    thread = cls(run)
+    thread = cls(run, raw=raw)
     started.wait()
     return thread
\ No newline at end of file
@@ -1,9 +1,8 @@
 import threading
 import time
-from functools import wraps
-from itertools import cycle
-from typing import TYPE_CHECKING, Generator, Callable, Any
-from weakref import ref
+from inspect import Parameter, signature
+from typing import TYPE_CHECKING, Callable, Any
+from weakref import finalize
 
 import oodle
 from oodle.exceptions import ExitThread
@@ -11,59 +10,144 @@ from oodle.exceptions import ExitThread
 if TYPE_CHECKING:
     from oodle.threads import Thread
 
+# Bound once so hot sleep and wait loops don't need a module attribute lookup per call
+_monotonic = time.monotonic
+
+# Sleeps shorter than this yield until their deadline instead of arming a timer that would oversleep them
+_SHORT_SLEEP = 0.001
+
+_fixed_arity_factories: dict[tuple[str, ...], Callable] = {}
+
 
 class AbortConcurrentCallsFunctionWrapper[**P]:
     """Decorator that prevents a function from being called concurrently on separate threads. Concurrent calls return
     immediately with a None return. It always returns None and drops any return the function has."""
     def __init__(self, function: Callable[P, None]):
         self.function = function
-        self.instances: dict[int | None, tuple[ref | None, Callable[P, None]]] = {}
+        self.instances: dict[int, list[bool]] = {}
+        self._bound_factory: Callable[[Callable[P, None], list[bool]], Callable[P, None]] | None = None
+        # Built up front, creating it lazily on the first call would let racing first calls each get their own guard
+        self._unbound_function = _wrap_in_guard(function, [True])
 
     def __call__(self, *args, **kwargs):
-        function = self._get_instance_function(None)
-        if not function:
-            function = self._wrap_in_lock(self.function, threading.Lock())
-            self._add_instance_function(None, function)
-
-        return function
+        return self._unbound_function(*args, **kwargs)
 
     def __get__(self, instance, owner):
         if not instance:
             return self
 
-        function = self._get_instance_function(instance)
-        if not function:
-            function = self._wrap_in_lock(self.function.__get__(instance, owner), threading.Lock())
-            self._add_instance_function(instance, function)
+        # Binding goes through the wrapped object so staticmethods, classmethods, and other descriptors bind as usual
+        bound = self.function.__get__(instance, owner)
+        if self._bound_factory is None:
+            self._bound_factory = _get_guard_factory(bound)
 
-        return function
+        return _copy_identity(self._bound_factory(bound, self._get_guard(instance)), bound)
 
-    def _add_instance_function(self, instance: Any, locked_func: Callable[P, None]):
+    def _get_guard(self, instance: Any) -> list[bool]:
+        """Gets the guard for an instance. These are keyed by id so that unhashable instances and distinct instances
+        that compare equal each get their own guard, a finalizer drops the entry when the instance is collected."""
         instance_id = id(instance)
-        def del_instance(_):
-            del self.instances[instance_id]
+        guard = self.instances.get(instance_id)
+        if guard is None:
+            created = [True]
+            guard = self.instances.setdefault(instance_id, created)
+            if guard is created:
+                finalize(instance, self.instances.pop, instance_id, None)
 
-        self.instances[instance_id] = (ref(instance, del_instance), locked_func)
+        return guard
 
-    def _get_instance_function(self, instance: Any) -> Callable[P, None] | None:
-        if id(instance) in self.instances:
-            return self.instances[id(instance)][1]
 
-        return None
+def _wrap_in_guard[**P](func: Callable[P, None], guard: list[bool]) -> Callable[P, None]:
+    return _copy_identity(_get_guard_factory(func)(func, guard), func)
+
+
+def _get_guard_factory(func: Callable) -> Callable[[Callable, list[bool]], Callable]:
+    """Gets the factory that creates guarded wrappers for a function, the fixed-arity factory when the function's
+    parameters allow it and the generic factory otherwise."""
+    if (names := _get_fixed_parameter_names(func)) is not None:
+        return _get_fixed_arity_factory(names)
+
+    return _create_generic_guard
+
+
+def _create_generic_guard[**P](func: Callable[P, None], guard: list[bool]) -> Callable[P, None]:
+    # The guard holds a single token, list.pop and list.append are atomic so whichever call pops the token runs and any
+    # concurrent calls find the list empty. This is much cheaper than a non-blocking lock acquire.
+    def wrapper(*args, **kwargs):
+        try:
+            guard.pop()
+        except IndexError:
+            return
+
+        try:
+            func(*args, **kwargs)
+        finally:
+            guard.append(True)
+
+    return wrapper
+
+
+def _copy_identity[**P](wrapper: Callable[P, None], func: Callable[P, None]) -> Callable[P, None]:
+    """Copies just the attributes needed for the wrapper to introspect and report errors as the function. This is
+    cheaper than functools.wraps which also copies the module, annotations, and updates the __dict__, a new wrapper is
+    created every time a method is accessed on an instance."""
+    wrapper.__name__ = getattr(func, "__name__", wrapper.__name__)
+    wrapper.__qualname__ = getattr(func, "__qualname__", wrapper.__qualname__)
+    wrapper.__doc__ = getattr(func, "__doc__", None)
+    wrapper.__wrapped__ = func
+    return wrapper
 
-    @staticmethod
-    def _wrap_in_lock(func: Callable[P, None], lock: threading.Lock) -> Callable[P, None]:
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            if not lock.acquire(blocking=False):
-                return
 
-            try:
-                func(*args, **kwargs)
-            finally:
-                lock.release()
+def _get_fixed_parameter_names(func: Callable) -> tuple[str, ...] | None:
+    """Returns the parameter names of a function that only takes required positional or keyword parameters. Returns
+    None for anything else (defaults, varargs, keyword only parameters, or no signature) so that the generic wrapper is
+    used."""
+    try:
+        parameters = signature(func, follow_wrapped=False).parameters.values()
+    except (TypeError, ValueError):
+        return None
+
+    names = []
+    for parameter in parameters:
+        if (
+            parameter.kind is not Parameter.POSITIONAL_OR_KEYWORD
+            or parameter.default is not Parameter.empty
+            or parameter.name.startswith("_acc_")
+        ):
+            return None
+
+        names.append(parameter.name)
+
+    return tuple(names)
+
+
+def _get_fixed_arity_factory(names: tuple[str, ...]) -> Callable[[Callable, list[bool]], Callable]:
+    """Gets a factory that creates guarded wrappers with the exact parameters given. Calling the function directly
+    avoids packing and unpacking args and kwargs on every call. Factories are compiled once per set of parameter
+    names."""
+    factory = _fixed_arity_factories.get(names)
+    if factory is None:
+        parameters = ", ".join(names)
+        namespace = {}
+        exec(
+            f"def factory(_acc_func, _acc_guard):\n"
+            f"    def wrapper({parameters}):\n"
+            f"        try:\n"
+            f"            _acc_guard.pop()\n"
+            f"        except IndexError:\n"
+            f"            return\n"
+            f"\n"
+            f"        try:\n"
+            f"            _acc_func({parameters})\n"
+            f"        finally:\n"
+            f"            _acc_guard.append(True)\n"
+            f"\n"
+            f"    return wrapper\n",
+            namespace,
+        )
+        factory = _fixed_arity_factories.setdefault(names, namespace["factory"])
 
-        return wrapper
+    return factory
 
 
 def abort_concurrent_calls[**P](func: Callable[P, None]) -> Callable[P, None]:
@@ -73,51 +157,45 @@ def abort_concurrent_calls[**P](func: Callable[P, None]) -> Callable[P, None]:
 
 
 def sleep(seconds: float, /):
-    """Sleep replacement that periodically gives control back to the interpreter to allow thrown exceptions to be
-    processed. If used within an Oodle thread it waits on the thread. Otherwise, time.sleep is used with very short
-    sleep durations."""
-    if hasattr(oodle.thread_locals, "thread"):
-        _sleep_on_thread(seconds, oodle.thread_locals.thread)
+    """Sleep replacement that can be interrupted when the thread is stopped. If used within an Oodle thread it waits on
+    the thread, waking as soon as the thread is stopped. Otherwise, time.sleep is used."""
+    thread = getattr(oodle.thread_locals, "thread", None)
+    if thread is not None:
+        _sleep_on_thread(seconds, thread)
 
     else:
         _sleep_periodically(seconds)
 
 
 def _sleep_periodically(seconds: float):
-    sleep_duration = generate_timeout_durations(seconds)
-    try:
-        duration = min(0.01, next(sleep_duration))
-        while duration > 0:
-            time.sleep(duration)
-            duration = min(0.01, next(sleep_duration))
-    except TimeoutError:
-        return
+    if seconds >= _SHORT_SLEEP:
+        time.sleep(seconds)
 
+    elif seconds > 0:
+        # Arming a timer costs more than these sleeps are asking for, so yield to other threads until the deadline
+        deadline = _monotonic() + seconds
+        while _monotonic() < deadline:
+            time.sleep(0)
 
-def _sleep_on_thread(seconds: float, thread: "Thread"):
-    sleep_duration = generate_timeout_durations(seconds)
-    try:
-        duration = min(0.01, next(sleep_duration))
-        while duration > 0 and not thread.stopping and not thread.wait(timeout=duration):
-            duration = min(0.01, next(sleep_duration))
-
-    except SystemError:
-        exiting = True
-    except TimeoutError:
-        exiting = False
-    else:
-        exiting = True # The thread has exited
 
-    if exiting:
+def _sleep_on_thread(seconds: float, thread: "Thread"):
+    # Stopping the thread wakes this wait immediately, so there is no need to wake up periodically to check
+    if thread._wait_until_stopping(max(seconds, 0)):
         raise ExitThread
 
 
 def wait_for(*threads: "Thread", timeout: float | None = None):
     """Waits for multiple threads to complete. This raises an ExceptionGroup of all errors raised in each thread. It
     does not stop threads for any reason."""
-    timeout_duration = generate_timeout_durations(timeout)
-    while any(thread.running for thread in threads):
-        sleep(min(0.01, next(timeout_duration)))
+    deadline = _monotonic() + timeout if timeout else None
+    waiter = getattr(oodle.thread_locals, "thread", None)
+    for thread in threads:
+        while not thread._wait_until_done(_wait_duration(deadline, waiter)):
+            if waiter is not None and waiter.stopping:
+                raise ExitThread
+
+            if deadline is not None and _monotonic() >= deadline:
+                raise TimeoutError
 
     if exceptions := [thread.exception for thread in threads if thread.exception]:
         raise ExceptionGroup(
@@ -126,27 +204,26 @@ def wait_for(*threads: "Thread", timeout: float | None = None):
         )
 
 
-def generate_timeout_durations(
-    timeout: float, clock: Callable[[], float] = time.monotonic
-) -> Generator[float, None, None]:
-    """Yields the remaining time according to the given clock. It defaults to using the time.monotonic clock."""
-    if not timeout:
-        yield from cycle([0])
-        return
-
-    start = clock()
-    while (elapsed := clock() - start) < timeout:
-        yield timeout - elapsed
-
-    raise TimeoutError
+def _wait_duration(deadline: float | None, waiter: "Thread | None") -> float | None:
+    """Returns how long to block waiting on a thread. Oodle threads wake up periodically so that they can still be
+    stopped while they wait."""
+    remaining = None if deadline is None else max(0.0, deadline - _monotonic())
+    if waiter is None:
+        return remaining
 
+    return 0.01 if remaining is None else min(0.01, remaining)
 
 
 def safely_acquire(lock: threading.Lock):
-    """Attempts to acquire a lock without being interrupted by an ExitThread or SystemError."""
+    """Attempts to acquire a lock without being interrupted by an ExitThread or SystemError. An uncontended lock is
+    taken with a single non-blocking acquire, only a contended lock falls back to a blocking acquire. Thrown exceptions
+    are only raised between bytecodes, so one that arrives after an acquire has returned means the lock is already held
+    and the final non-blocking acquire is a no-op. It only takes the lock when the exception arrived before the acquire.
+    Retrying the blocking acquire in a loop would deadlock on a lock that is already held."""
     try:
+        if lock.acquire(blocking=False):
+            return
+
         lock.acquire()
     except (ExitThread, SystemError):
-        pass
-
-    lock.acquire(blocking=False)
+        lock.acquire(blocking=False)
@@ -1,10 +1,16 @@
+import threading
+from copy import copy
+from dataclasses import dataclass
+from functools import wraps
 from queue import Queue
-from threading import Event, Lock
+from threading import Event, Lock, current_thread
 
 import pytest
 
 from oodle import Shield, ThreadGroup, Channel, Thread
-from oodle.dispatch_queues import DispatchQueue, IllegalDispatchException, queued_dispatch, QueuedDispatcher
+from oodle.dispatch_queues import (
+    DispatchQueue, IllegalDispatchException, queued_dispatch, QueuedDispatcher, WorkStealingDispatchPool
+)
 from oodle.utilities import sleep, wait_for, abort_concurrent_calls
 
 
@@ -25,6 +31,49 @@ def test_thread_group():
     assert queue.qsize() == 10
 
 
+def test_thread_group_run_many():
+    def add_to_queue(q: Queue, value: int):
+        q.put(value)
+
+    queue = Queue()
+    with ThreadGroup() as group:
+        threads = group.run_many(add_to_queue, ((queue, i) for i in range(10)))
+
+    assert len(threads) == 10
+    assert sorted(queue.get() for _ in range(10)) == list(range(10))
+
+
+def test_thread_group_run_many_args_error():
+    def generate_args():
+        yield 1,
+        raise ValueError
+
+    before = threading.active_count()
+    with pytest.raises(ValueError):
+        ThreadGroup().run_many(print, generate_args())
+
+    assert threading.active_count() == before
+
+
+def test_thread_group_run_many_doesnt_leak_threads():
+    def get_current_thread(value: int):
+        # Logging records call current_thread, before Python 3.13 raw threads leak a dummy thread when it is called
+        current_thread()
+
+    before = len(threading.enumerate())
+    with ThreadGroup() as group:
+        group.run_many(get_current_thread, ((i,) for i in range(50)))
+
+    # Finished threads can take a moment to unregister from the threading module, leaked ones never do
+    for _ in range(100):
+        if len(threading.enumerate()) == before:
+            break
+
+        sleep(0.01)
+
+    assert len(threading.enumerate()) == before
+
+
 def test_channels():
     e1 = Event()
     e2 = Event()
@@ -53,6 +102,26 @@ def test_channels():
     assert c.is_empty
 
 
+def test_channel_close_wakes_blocked_get():
+    c = Channel()
+    started = Event()
+    errors = []
+
+    def consumer():
+        started.set()
+        try:
+            c.get()
+        except ValueError as e:
+            errors.append(e)
+
+    t = Thread.run(consumer)
+    started.wait()
+    sleep(0.01)
+    c.close()
+    wait_for(t)
+    assert len(errors) == 1
+
+
 def test_thread_group_error():
     e1 = Event()
     e2 = Event()
@@ -122,6 +191,20 @@ def test_thread_shields():
         t.stop(0.1)
 
 
+def test_thread_nested_shields():
+    def foo():
+        with Shield():
+            with Shield():
+                l.append("inner")
+
+            l.append("outer")
+
+    l = []
+    t = Thread.run(foo)
+    wait_for(t, timeout=1)
+    assert l == ["inner", "outer"]
+
+
 def test_channel_get_first():
     l1, l2, l3 = Lock(), Lock(), Lock()
 
@@ -206,6 +289,68 @@ def test_dispatch_queue_doesnt_deadlock_on_own_thread():
         q.dispatch(foo)
 
 
+def test_dispatch_queue_reraises_and_returns():
+    def fail():
+        raise ValueError
+
+    q = DispatchQueue()
+    with pytest.raises(ValueError):
+        q.dispatch(fail)
+
+    assert q.dispatch(lambda: "foo") == "foo"
+    assert q.dispatch_future(lambda: "bar").result() == "bar"
+
+
+def test_dispatch_queue_stops_when_exit_is_swallowed():
+    def swallow():
+        started.set()
+        try:
+            while True:
+                pass
+        except Exception:
+            pass
+
+    started = Event()
+    q = DispatchQueue()
+    future = q.dispatch_future(swallow)
+    started.wait()
+    q.stop()
+    assert future.result(timeout=1) is None
+    assert q._thread.wait(timeout=1)
+
+
+def test_work_stealing_dispatch_pool():
+    def square(value):
+        return value * value
+
+    def fan_out(value):
+        return [pool.dispatch_future(square, value + i) for i in range(4)]
+
+    pool = WorkStealingDispatchPool(4)
+    futures = [pool.dispatch_future(square, i) for i in range(100)]
+    assert [future.result() for future in futures] == [i * i for i in range(100)]
+    assert [future.result() for future in pool.dispatch(fan_out, 10)] == [100, 121, 144, 169]
+    assert pool.dispatch(square, 3) == 9
+    pool.stop()
+
+
+def test_work_stealing_dispatch_pool_ordered():
+    def foo(delay, message):
+        if delay:
+            sleep(delay)
+
+        l.append(message)
+
+    l = []
+    pool = WorkStealingDispatchPool(mode="ordered")
+    futures = [pool.dispatch_future(foo, 0.01, "foo"), pool.dispatch_future(foo, 0, "bar")]
+    for future in futures:
+        future.result()
+
+    assert l == ["foo", "bar"]
+    pool.stop()
+
+
 def test_dispatch_queue_decorator():
     @queued_dispatch
     def foo(delay, message):
@@ -221,6 +366,23 @@ def test_dispatch_queue_decorator():
     assert l == ["foo", "bar"]
 
 
+def test_dispatch_queue_decorator_queues():
+    @queued_dispatch
+    def shared_a():
+        return current_thread()
+
+    @queued_dispatch()
+    def shared_b():
+        return current_thread()
+
+    @queued_dispatch(per_function=True)
+    def dedicated():
+        return current_thread()
+
+    assert shared_a() is shared_b()
+    assert dedicated() is not shared_a()
+
+
 def test_dispatch_queue_class():
     class Testing(QueuedDispatcher):
         def __init__(self):
@@ -264,6 +426,48 @@ def test_dispatch_queue_class():
     assert testing.a_property == "a_property"
 
 
+def test_dispatch_queue_class_mixin():
+    class Mixin:
+        def get_thread(self):
+            return current_thread()
+
+    class Testing(Mixin, QueuedDispatcher):
+        def get_own_thread(self):
+            return current_thread()
+
+    testing = Testing()
+    assert testing.get_thread() is testing.get_own_thread()
+    assert testing.get_thread() is not current_thread()
+
+
+def test_dispatch_queue_class_copy():
+    class Testing(QueuedDispatcher):
+        def __init__(self):
+            super().__init__()
+            self.result = []
+
+        def add_result(self, message):
+            self.result.append(message)
+
+    original = Testing()
+    original.add_result(1)
+    duplicate = copy(original)
+    duplicate.result = []
+    duplicate.add_result(2)
+    assert original.result == [1]
+    assert duplicate.result == [2]
+
+
+def test_wait_for_timeout():
+    t = Thread.run(sleep, 100)
+    with pytest.raises(TimeoutError):
+        wait_for(t, timeout=0.05)
+
+    t.stop()
+    wait_for(t)
+    assert t.running is False
+
+
 def test_concurrent_methods():
     class Testing:
         @abort_concurrent_calls
@@ -283,3 +487,100 @@ def test_concurrent_methods():
     e.set()
     wait_for(*threads)
     assert r == {"foo", "bar"}
+
+
+def test_concurrent_methods_on_dataclasses():
+    @dataclass
+    class Unhashable:
+        name: str
+
+        @abort_concurrent_calls
+        def foo(self):
+            r.append(self.name)
+
+    @dataclass(frozen=True)
+    class Equal:
+        name: str
+
+        @abort_concurrent_calls
+        def foo(self):
+            r.append(self.name)
+            if self is a:
+                b.foo()
+
+    r = []
+    Unhashable("unhashable").foo()
+    a, b = Equal("a"), Equal("a")
+    a.foo()
+    assert r == ["unhashable", "a", "a"]
+
+
+def test_concurrent_methods_call_signatures():
+    def with_context(func):
+        @wraps(func)
+        def wrapper(self, value):
+            func(self, "context", value)
+
+        return wrapper
+
+    class Testing:
+        @abort_concurrent_calls
+        def fixed(self, a, b):
+            r.append((a, b))
+
+        @abort_concurrent_calls
+        def defaults(self, a, b=2, *args, c=3):
+            r.append((a, b, args, c))
+
+        @abort_concurrent_calls
+        @with_context
+        def injected(self, context, value):
+            r.append((context, value))
+
+    r = []
+    testing = Testing()
+    testing.fixed(1, b=2)
+    testing.defaults(1, 2, 3, c=4)
+    testing.defaults(1)
+    testing.injected(1)
+    assert r == [(1, 2), (1, 2, (3,), 4), (1, 2, (), 3), ("context", 1)]
+    with pytest.raises(TypeError):
+        testing.fixed(1)
+
+
+def test_concurrent_functions():
+    @abort_concurrent_calls
+    def foo(message):
+        r.add(message)
+        e.wait()
+
+    e = Event()
+    r = set()
+    t = Thread.run(foo, "foo")
+    while not r:
+        sleep(0.001)
+
+    assert foo("foo-no") is None
+    e.set()
+    wait_for(t)
+    foo("bar")
+    assert r == {"foo", "bar"}
+
+
+def test_concurrent_static_and_class_methods():
+    class Testing:
+        @abort_concurrent_calls
+        @staticmethod
+        def static(message):
+            r.append(message)
+
+        @abort_concurrent_calls
+        @classmethod
+        def klass(cls, message):
+            r.append((cls, message))
+
+    r = []
+    testing = Testing()
+    testing.static("static")
+    testing.klass("class")
+    assert r == ["static", (Testing, "class")]
@@ -58,3 +58,60 @@ def test_stop_sleep_with_shield():
     e.wait()
     t.stop(wait=True)
     assert v == 1
+
+
+def test_sleep_zero_on_thread():
+    v = 0
+    def f():
+        nonlocal v
+        sleep(0)
+        v = 1
+
+    t = Thread.run(f)
+    t.wait()
+    assert v == 1
+
+
+def test_spawn_raw():
+    e = Event()
+    value = 0
+    def f():
+        nonlocal value
+        e.wait()
+        value = 1
+
+    t = Thread.spawn_raw(f)
+    assert t.running
+    e.set()
+    t.wait()
+    assert value == 1
+
+
+def test_stop_raw():
+    t = Thread.spawn_raw(sleep, 100)
+    t.stop()
+    t.wait(1)
+    assert t.running is False
+
+
+def test_stop_after_swallowed_exit():
+    looping = Event()
+    swallowed = 0
+    def f():
+        nonlocal swallowed
+        while swallowed < 2:
+            try:
+                looping.set()
+                while True:
+                    pass
+            except Exception:
+                swallowed += 1
+
+    t = Thread.run(f)
+    looping.wait()
+    looping.clear()
+    t.stop()
+    looping.wait()
+    t.stop()
+    assert t.wait(1)
+    assert swallowed == 2